@@ -1,11 +1,220 @@
 import praw
 import json
-from datetime import datetime
+from datetime import datetime, date, timedelta
 import re
 import os
 from dotenv import load_dotenv
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
+class BrandSentimentStore:
+    """Per-brand, per-day sentiment counters that posts are folded into incrementally"""
+
+    def __init__(self, brands, analyzer=None):
+        self.brands = list(brands)
+        self.analyzer = analyzer or SentimentIntensityAnalyzer()
+        self.buckets = {}  # 'YYYY-MM-DD' -> brand -> counters
+        self.seen_ids = set()  # Post ids and comment keys already folded in
+        self.backfill = {}  # Brand added after loading -> seen keys not yet counted for it
+
+    @staticmethod
+    def _empty_counters():
+        return {
+            'mentions': 0,
+            'positive': 0,
+            'negative': 0,
+            'neutral': 0,
+            'compound_sum': 0.0,
+            'weighted_compound_sum': 0.0,
+            'weight_sum': 0,
+        }
+
+    @staticmethod
+    def _post_texts(post):
+        #Yield (key, text, created, score) for the post body and each of its comments
+        yield post['id'], post['title'] + ' ' + post['selftext'], post['created'], post['score']
+
+        # Comments are keyed by post id + timestamp, since older scrapes didn't record comment ids
+        for comment in post['comments']:
+            yield f"{post['id']}:{comment['created']}", comment['body'], comment['created'], comment['score']
+
+    def add_posts(self, posts, totals=None):
+        """Fold in post bodies and comments not seen before, returns how many texts were added.
+
+        A re-scraped post still contributes comments that are new since the last run.
+        Text is only counted once, so its weight stays at the score it had when first seen.
+        If `totals` (brand -> counters) is passed, every text in `posts` is also counted into it,
+        seen or not, reusing the same sentiment scores.
+        """
+        brands = list(self.brands)
+        if totals is not None:
+            brands += [brand for brand in totals if brand not in brands]
+
+        added = 0
+        for post in posts:
+            for key, text, created, score in self._post_texts(post):
+                is_new = key not in self.seen_ids
+                backfill = [brand for brand, keys in self.backfill.items() if key in keys]
+                if not is_new and not backfill and totals is None:
+                    continue
+
+                counts = self._text_counts(text, score, brands)
+                if is_new:
+                    self.seen_ids.add(key)
+                    self._fold(created[:10], counts, self.brands)
+                    added += 1
+                else:
+                    self._fold(created[:10], counts, backfill)
+                    for brand in backfill:
+                        self.backfill[brand].discard(key)
+                        if not self.backfill[brand]:
+                            del self.backfill[brand]
+
+                if totals is not None:
+                    for brand in totals:
+                        self._merge(totals[brand], counts[brand])
+        return added
+
+    def _text_counts(self, text, score, brands):
+        #Per-brand counters for one text, each sentence is scored at most once
+        counts = {brand: self._empty_counters() for brand in brands}
+        weight = max(score, 1)  # Downvoted text still counts once
+
+        # Split into sentences
+        sentences = text.lower().replace('!', '.').replace('?', '.').split('.')
+
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if len(sentence) < 10:
+                continue
+
+            mentioned = [brand for brand in brands if brand.lower() in sentence]
+            if not mentioned:
+                continue
+
+            # Analyze sentiment of this sentence
+            compound = self.analyzer.polarity_scores(sentence)['compound']
+
+            for brand in mentioned:
+                counters = counts[brand]
+                counters['mentions'] += 1
+                counters['compound_sum'] += compound
+                counters['weighted_compound_sum'] += compound * weight
+                counters['weight_sum'] += weight
+
+                if compound >= 0.05:
+                    counters['positive'] += 1
+                elif compound <= -0.05:
+                    counters['negative'] += 1
+                else:
+                    counters['neutral'] += 1
+        return counts
+
+    @staticmethod
+    def _merge(target, counters):
+        for key, value in counters.items():
+            target[key] += value
+
+    def _fold(self, day, counts, brands):
+        #Add per-text counters into the day's bucket, skipping brands with no mentions
+        for brand in brands:
+            if counts[brand]['mentions']:
+                bucket = self.buckets.setdefault(day, {})
+                self._merge(bucket.setdefault(brand, self._empty_counters()), counts[brand])
+
+    def window(self, days=None, end=None):
+        #Merge daily buckets for the last `days` days up to `end`, or every bucket if days is None
+        totals = {brand: self._empty_counters() for brand in self.brands}
+
+        if days is None:
+            day_keys = list(self.buckets)
+        else:
+            end = end or date.today()
+            day_keys = [(end - timedelta(days=i)).isoformat() for i in range(days)]
+
+        for day in day_keys:
+            for brand, counters in self.buckets.get(day, {}).items():
+                if brand not in totals:
+                    continue
+                for key, value in counters.items():
+                    totals[brand][key] += value
+        return totals
+
+    def trend(self, brand, days=30, end=None):
+        #Daily mention counts and average compound score, oldest day first
+        end = end or date.today()
+        series = []
+        for i in reversed(range(days)):
+            day = (end - timedelta(days=i)).isoformat()
+            counters = self.buckets.get(day, {}).get(brand, self._empty_counters())
+            series.append({
+                'date': day,
+                'mentions': counters['mentions'],
+                'avg_compound': counters['compound_sum'] / max(counters['mentions'], 1)
+            })
+        return series
+
+    def rank_brands(self, days=30, end=None):
+        #Brands ordered by mentions in the window, with their score-weighted sentiment
+        totals = self.window(days, end)
+        ranking = []
+        for brand, counters in totals.items():
+            ranking.append({
+                'brand': brand,
+                'mentions': counters['mentions'],
+                'positive_ratio': counters['positive'] / max(counters['mentions'], 1),
+                'weighted_sentiment': counters['weighted_compound_sum'] / max(counters['weight_sum'], 1)
+            })
+        return sorted(ranking, key=lambda x: x['mentions'], reverse=True)
+
+    def save(self, filename='brand_sentiment_store.json'):
+        """Save aggregate counters to JSON file"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump({
+                'brands': self.brands,
+                'seen_ids': sorted(self.seen_ids),
+                'backfill': {brand: sorted(keys) for brand, keys in self.backfill.items()},
+                'buckets': self.buckets
+            }, f, indent=2, ensure_ascii=False)
+        print(f"Saved sentiment aggregates for {len(self.buckets)} days to {filename}")
+
+    @classmethod
+    def load(cls, filename='brand_sentiment_store.json', brands=None):
+        """Load aggregate counters from JSON file, or start empty with `brands` if it doesn't exist.
+
+        If `brands` differs from the saved list, removed brands are dropped and added brands
+        start at zero, picking up already-seen posts the next time they are scraped.
+        """
+        if not os.path.exists(filename):
+            if brands is None:
+                raise ValueError(f"No saved store at {filename}, pass brands to start a new one")
+            return cls(brands)
+        with open(filename, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        store = cls(data['brands'])
+        store.seen_ids = set(data['seen_ids'])
+        store.backfill = {brand: set(keys) for brand, keys in data.get('backfill', {}).items()}
+        store.buckets = data['buckets']
+
+        if brands is not None and sorted(brands) != sorted(data['brands']):
+            added = [brand for brand in brands if brand not in data['brands']]
+            removed = [brand for brand in data['brands'] if brand not in brands]
+            print(f"Brand list changed since {filename} was saved (added: {added}, removed: {removed}), "
+                  f"keeping history for the rest")
+
+            store.brands = list(brands)
+            for day in list(store.buckets):
+                for brand in removed:
+                    store.buckets[day].pop(brand, None)
+                if not store.buckets[day]:
+                    del store.buckets[day]
+            for brand in removed:
+                store.backfill.pop(brand, None)
+            for brand in added:
+                if store.seen_ids:
+                    store.backfill[brand] = set(store.seen_ids)
+        return store
+
 class RedditVacuumScraper:
     def __init__(self, client_id, client_secret, user_agent):
         self.reddit = praw.Reddit(
@@ -76,6 +285,7 @@ class RedditVacuumScraper:
             if len(comment.body)>20: #Skip short comments
                 top_comments.append({
                     'body': comment.body,
+                    'id': comment.id,
                     'score': comment.score,
                     'created': datetime.fromtimestamp(comment.created_utc).isoformat()
                 })
@@ -96,47 +306,20 @@ class RedditVacuumScraper:
     
     from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
-    def analyze_brand_sentiment(self, posts, brands):
-        analyzer = SentimentIntensityAnalyzer()
+    def analyze_brand_sentiment(self, posts, brands, store=None):
+        #Counts cover only the posts passed in, a store if given also gets any new text folded into its daily buckets
+        if store is None:
+            store = BrandSentimentStore([])
+        totals = {brand: BrandSentimentStore._empty_counters() for brand in brands}
+        store.add_posts(posts, totals=totals)
 
-        brand_mentions = {brand: 0 for brand in brands}
-        brand_sentiment = {brand: {'positive': 0, 'negative': 0, 'neutral': 0} for brand in brands}
-        
-        for post in posts:
-            text = (post['title'] + ' ' + post['selftext']).lower()
-            
-            # Add comments to text
-            for comment in post['comments']:
-                text += ' ' + comment['body'].lower()
-            
-            # Split into sentences
-            sentences = text.replace('!', '.').replace('?', '.').split('.')
-            
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if len(sentence) < 10:
-                    continue
-                    
-                for brand in brands:
-                    if brand.lower() in sentence:
-                        brand_mentions[brand] += 1
-                        
-                        # Analyze sentiment of this sentence
-                        scores = analyzer.polarity_scores(sentence)
-                        
-                        if scores['compound'] >= 0.05:
-                            brand_sentiment[brand]['positive'] += 1
-                        elif scores['compound'] <= -0.05:
-                            brand_sentiment[brand]['negative'] += 1
-                        else:
-                            brand_sentiment[brand]['neutral'] += 1
-        
         return {
-            'brand_mentions': brand_mentions,
-            'brand_sentiment': brand_sentiment
+            'brand_mentions': {brand: totals[brand]['mentions'] for brand in brands},
+            'brand_sentiment': {
+                brand: {key: totals[brand][key] for key in ('positive', 'negative', 'neutral')}
+                for brand in brands
+            }
         }
-        
-    
 
     def save_data(self, posts, filename='vacuum_discussions.json'):
         """Save scraped data to JSON file"""
@@ -166,6 +349,7 @@ def main():
 
 
     scraper = RedditVacuumScraper(CLIENT_ID, CLIENT_SECRET, USER_AGENT)
+    store = BrandSentimentStore.load(brands=brands)
 
     print("Starting Reddit Vacuum discussion scraper")
 
@@ -173,9 +357,9 @@ def main():
     print(f"Found {len(posts)} vacuum-related posts")
 
     # Analyze the data
-    analysis = scraper.analyze_brand_sentiment(posts, brands)
+    analysis = scraper.analyze_brand_sentiment(posts, brands, store=store)
 
-    print("\n Most mentioned brands:")
+    print("\n Most mentioned brands in this scrape:")
     sorted_brands = sorted(analysis['brand_mentions'].items(), key=lambda x: x[1], reverse=True)
     for brand, count in sorted_brands[:5]:
         if count > 0:
@@ -183,8 +367,17 @@ def main():
             total_sentiment = sum(sentiment.values())
             pos_ratio = sentiment['positive'] / max(total_sentiment, 1) * 100
             print(f"  {brand.capitalize()}: {count} mentions ({pos_ratio:.1f}% positive)")
+
+    for days in (7, 30, 90):
+        print(f"\n Top brands over the last {days} days:")
+        for entry in store.rank_brands(days)[:5]:
+            if entry['mentions'] > 0:
+                print(f"  {entry['brand'].capitalize()}: {entry['mentions']} mentions "
+                      f"({entry['positive_ratio'] * 100:.1f}% positive, weighted sentiment {entry['weighted_sentiment']:.2f})")
+
     # Save the data
     scraper.save_data(posts)
+    store.save()
     
     print("\n✅ Scraping complete! Check vacuum_discussions.json for full data")
 
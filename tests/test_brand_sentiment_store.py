@@ -0,0 +1,239 @@
+# test_brand_sentiment_store.py
+
+import os
+import sys
+from datetime import date
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'scraper'))
+
+import pytest
+
+from scrape_reddit import BrandSentimentStore, RedditVacuumScraper
+
+
+class FakeAnalyzer:
+    # Stands in for VADER: 'great' is positive, 'awful' is negative, anything else neutral
+    def __init__(self):
+        self.calls = 0
+
+    def polarity_scores(self, sentence):
+        self.calls += 1
+        if 'great' in sentence:
+            return {'compound': 0.8}
+        if 'awful' in sentence:
+            return {'compound': -0.8}
+        return {'compound': 0.0}
+
+
+def make_post(post_id, created, title, comments=(), score=1):
+    return {
+        'id': post_id,
+        'title': title,
+        'selftext': '',
+        'score': score,
+        'created': created,
+        'comments': [
+            {'id': f'{post_id}_c{i}', 'body': body, 'score': 1, 'created': comment_created}
+            for i, (body, comment_created) in enumerate(comments)
+        ]
+    }
+
+
+def make_store(brands=('roomba', 'roborock')):
+    return BrandSentimentStore(brands, analyzer=FakeAnalyzer())
+
+
+def test_comments_on_different_days_land_in_separate_buckets():
+    store = make_store()
+    store.add_posts([make_post('p1', '2025-06-01T10:00:00', 'My roomba is great', comments=[
+        ('The roomba got stuck again, awful', '2025-06-02T09:00:00'),
+        ('Roborock handles rugs fine for me', '2025-06-03T09:00:00'),
+    ])])
+
+    assert store.buckets['2025-06-01']['roomba']['positive'] == 1
+    assert store.buckets['2025-06-02']['roomba']['negative'] == 1
+    assert store.buckets['2025-06-03']['roborock']['neutral'] == 1
+    assert 'roomba' not in store.buckets['2025-06-03']
+
+
+def test_window_includes_both_boundary_days():
+    store = make_store()
+    store.add_posts([
+        make_post('p1', '2025-06-01T10:00:00', 'Roomba day one post'),
+        make_post('p2', '2025-06-07T10:00:00', 'Roomba day seven post'),
+        make_post('p3', '2025-06-08T10:00:00', 'Roomba day eight post'),
+    ])
+
+    # 7 days ending on the 7th covers the 1st through the 7th
+    assert store.window(7, end=date(2025, 6, 7))['roomba']['mentions'] == 2
+    assert store.window(1, end=date(2025, 6, 8))['roomba']['mentions'] == 1
+    assert store.window()['roomba']['mentions'] == 3
+
+
+def test_add_posts_ignores_seen_ids_but_keeps_new_comments():
+    store = make_store()
+    post = make_post('p1', '2025-06-01T10:00:00', 'Roomba first impressions')
+
+    assert store.add_posts([post]) == 1
+    assert store.add_posts([post]) == 0
+    assert store.window()['roomba']['mentions'] == 1
+
+    # Re-scraped post with a new top comment only adds the comment
+    rescraped = make_post('p1', '2025-06-01T10:00:00', 'Roomba first impressions', comments=[
+        ('Roomba battery lasts ages', '2025-06-02T10:00:00'),
+    ])
+    assert store.add_posts([rescraped]) == 1
+    assert store.window()['roomba']['mentions'] == 2
+
+
+def test_trend_is_oldest_first_with_zero_filled_gaps():
+    store = make_store()
+    store.add_posts([
+        make_post('p1', '2025-06-01T10:00:00', 'Roomba is great here'),
+        make_post('p2', '2025-06-03T10:00:00', 'Roomba is awful here'),
+    ])
+
+    trend = store.trend('roomba', days=3, end=date(2025, 6, 3))
+
+    assert [day['date'] for day in trend] == ['2025-06-01', '2025-06-02', '2025-06-03']
+    assert [day['mentions'] for day in trend] == [1, 0, 1]
+    assert trend[0]['avg_compound'] == 0.8
+    assert trend[1]['avg_compound'] == 0.0
+    assert trend[2]['avg_compound'] == -0.8
+
+
+def test_rank_brands_orders_by_mentions():
+    store = make_store(('roomba', 'roborock', 'shark'))
+    store.add_posts([
+        make_post('p1', '2025-06-01T10:00:00', 'Roborock beats everything', comments=[
+            ('Roborock mapping is great', '2025-06-01T11:00:00'),
+            ('Roomba still works for me', '2025-06-01T12:00:00'),
+        ]),
+    ])
+
+    ranking = store.rank_brands(7, end=date(2025, 6, 1))
+
+    assert [entry['brand'] for entry in ranking] == ['roborock', 'roomba', 'shark']
+    assert [entry['mentions'] for entry in ranking] == [2, 1, 0]
+    assert ranking[0]['positive_ratio'] == 0.5
+
+
+def test_save_load_round_trip(tmp_path):
+    filename = str(tmp_path / 'store.json')
+    store = make_store()
+    store.add_posts([make_post('p1', '2025-06-01T10:00:00', 'Roomba is great', comments=[
+        ('Roborock is awful at corners', '2025-06-02T10:00:00'),
+    ])])
+    store.save(filename)
+
+    loaded = BrandSentimentStore.load(filename, brands=['roborock', 'roomba'])
+
+    assert loaded.seen_ids == store.seen_ids
+    assert loaded.buckets == store.buckets
+
+
+def test_load_with_changed_brands_keeps_history(tmp_path):
+    filename = str(tmp_path / 'store.json')
+    store = make_store()
+    post = make_post('p1', '2025-06-01T10:00:00', 'Roomba and roborock and ecovacs showdown')
+    store.add_posts([post])
+    store.save(filename)
+
+    loaded = BrandSentimentStore.load(filename, brands=['roomba', 'ecovacs'])
+    loaded.analyzer = FakeAnalyzer()
+
+    assert loaded.window()['roomba']['mentions'] == 1
+    assert 'roborock' not in loaded.window()
+    assert 'roborock' not in loaded.buckets['2025-06-01']
+    assert loaded.window()['ecovacs']['mentions'] == 0
+
+    # A re-scraped post backfills only the added brand, once
+    assert loaded.add_posts([post]) == 0
+    assert loaded.add_posts([post]) == 0
+    assert loaded.window()['roomba']['mentions'] == 1
+    assert loaded.window()['ecovacs']['mentions'] == 1
+    assert loaded.backfill == {}
+
+
+def test_load_missing_file_requires_brands(tmp_path):
+    filename = str(tmp_path / 'missing.json')
+
+    with pytest.raises(ValueError):
+        BrandSentimentStore.load(filename)
+    assert BrandSentimentStore.load(filename, brands=['roomba']).brands == ['roomba']
+
+
+def test_comment_counted_once_whether_or_not_it_has_an_id():
+    store = make_store()
+    old_scrape = make_post('p1', '2025-06-01T10:00:00', 'Thread title', comments=[
+        ('Roomba battery lasts ages', '2025-06-02T10:00:00'),
+    ])
+    del old_scrape['comments'][0]['id']
+    new_scrape = make_post('p1', '2025-06-01T10:00:00', 'Thread title', comments=[
+        ('Roomba battery lasts ages', '2025-06-02T10:00:00'),
+    ])
+
+    store.add_posts([old_scrape])
+    assert store.add_posts([new_scrape]) == 0
+    assert store.window()['roomba']['mentions'] == 1
+
+
+def baseline_brand_sentiment(posts, brands, analyzer):
+    # analyze_brand_sentiment as it was before the aggregate store
+    brand_mentions = {brand: 0 for brand in brands}
+    brand_sentiment = {brand: {'positive': 0, 'negative': 0, 'neutral': 0} for brand in brands}
+    for post in posts:
+        text = (post['title'] + ' ' + post['selftext']).lower()
+        for comment in post['comments']:
+            text += ' ' + comment['body'].lower()
+        for sentence in text.replace('!', '.').replace('?', '.').split('.'):
+            sentence = sentence.strip()
+            if len(sentence) < 10:
+                continue
+            for brand in brands:
+                if brand.lower() in sentence:
+                    brand_mentions[brand] += 1
+                    compound = analyzer.polarity_scores(sentence)['compound']
+                    if compound >= 0.05:
+                        brand_sentiment[brand]['positive'] += 1
+                    elif compound <= -0.05:
+                        brand_sentiment[brand]['negative'] += 1
+                    else:
+                        brand_sentiment[brand]['neutral'] += 1
+    return {'brand_mentions': brand_mentions, 'brand_sentiment': brand_sentiment}
+
+
+SCRAPE = [
+    make_post('p1', '2025-06-01T10:00:00', 'Roomba is great. Roborock is awful!', comments=[
+        ('Roborock mapping is great.', '2025-06-02T10:00:00'),
+        ('Roomba and roborock both got stuck.', '2025-06-03T10:00:00'),
+    ]),
+    make_post('p2', '2025-06-04T10:00:00', 'Which shark should I buy?'),
+]
+
+
+def test_analyze_brand_sentiment_matches_baseline():
+    scraper = RedditVacuumScraper.__new__(RedditVacuumScraper)
+    brands = ['roomba', 'roborock', 'shark', 'eufy']
+    store = make_store(('roomba', 'roborock'))
+
+    expected = baseline_brand_sentiment(SCRAPE, brands, FakeAnalyzer())
+
+    # Brands outside the store's list are still counted for this call
+    assert scraper.analyze_brand_sentiment(SCRAPE, brands, store=store) == expected
+    assert scraper.analyze_brand_sentiment(SCRAPE, brands, store=store) == expected
+    assert store.window()['roomba']['mentions'] == 2
+
+
+def test_analyze_brand_sentiment_scores_each_sentence_once():
+    scraper = RedditVacuumScraper.__new__(RedditVacuumScraper)
+    brands = ['roomba', 'roborock', 'shark']
+    store = make_store(('roomba', 'roborock'))
+    matching_sentences = 5
+
+    scraper.analyze_brand_sentiment(SCRAPE, brands, store=store)
+    assert store.analyzer.calls == matching_sentences
+
+    # Nothing new: only this call's totals need scores, the store isn't scored again
+    scraper.analyze_brand_sentiment(SCRAPE, brands, store=store)
+    assert store.analyzer.calls == 2 * matching_sentences